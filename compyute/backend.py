@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import gc
+import math
 from abc import ABC
 from collections.abc import Generator
 from contextlib import contextmanager
@@ -10,12 +11,19 @@ from dataclasses import dataclass
 from types import ModuleType
 from typing import Any, ClassVar, Optional, TypeAlias
 
-import cupy
 import numpy
 
+try:
+    import cupy
+except ImportError:  # GPU support is installed with the "cuda12" extra
+    cupy = None
+
 __all__ = ["cpu", "cuda", "Device", "CUDA", "CPU", "set_default_device", "use_device"]
 
 
+_CUPY_MISSING = "CuPy is not installed, install compyute[cuda12]."
+
+
 class CUDARuntimeError(Exception):
     """Cuda error."""
 
@@ -68,10 +76,14 @@ class CUDA(Device):
 
     @property
     def cupy_device(self) -> cupy.cuda.Device:
+        if cupy is None:
+            raise CUDARuntimeError(_CUPY_MISSING)
         return cupy.cuda.Device(self.index)
 
     @property
     def properties(self) -> Optional[dict[str, Any]]:
+        if cupy is None:
+            raise CUDARuntimeError(_CUPY_MISSING)
         try:
             return cupy.cuda.runtime.getDeviceProperties(self.index)
         except Exception:
@@ -79,8 +91,9 @@ class CUDA(Device):
 
     @property
     def memory_info(self) -> dict[str, int]:
+        device = self.cupy_device
         try:
-            free, total = self.cupy_device.mem_info
+            free, total = device.mem_info
             return {"used": total - free, "free": free, "total": total}
         except Exception:
             raise CUDARuntimeError()
@@ -90,18 +103,35 @@ cpu = CPU("cpu")
 cuda = CUDA("cuda", 0)
 
 
-ArrayLike: TypeAlias = numpy.ndarray | cupy.ndarray
+if cupy is None:
+    ArrayLike: TypeAlias = numpy.ndarray
+else:
+    ArrayLike: TypeAlias = numpy.ndarray | cupy.ndarray  # type: ignore[no-redef]
 
 
 def data_to_device(data: ArrayLike, device: Device) -> ArrayLike:
     """Moves the data to the specified device."""
     if device == cpu:
-        return cupy.asnumpy(data)
+        return data if cupy is None else cupy.asnumpy(data)
+    if cupy is None:
+        raise CUDARuntimeError(_CUPY_MISSING)
     return cupy.asarray(data)
 
 
+def pinned_empty(shape: tuple[int, ...], dtype: type) -> numpy.ndarray:
+    """Returns an uninitialized NumPy array allocated in page-locked host memory.
+    Copies from page-locked memory to the GPU can run asynchronously."""
+    if cupy is None:
+        return numpy.empty(shape, dtype)
+    count = math.prod(shape)
+    memory = cupy.cuda.alloc_pinned_memory(count * numpy.dtype(dtype).itemsize)
+    return numpy.frombuffer(memory, dtype, count).reshape(shape)
+
+
 def gpu_available() -> bool:
     """Checks if GPU is available."""
+    if cupy is None:
+        return False
     try:
         return cupy.cuda.is_available()
     except Exception:
@@ -170,7 +200,7 @@ def use_device(device: Device) -> Generator:
 
 def get_device_from_array(array: ArrayLike) -> Device:
     """Infers the device by type."""
-    if isinstance(array, cupy.ndarray):
+    if cupy is not None and isinstance(array, cupy.ndarray):
         return cuda
     return cpu
 
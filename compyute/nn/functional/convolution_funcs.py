@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from ...tensor_ops.creation_ops import zeros
+from ...tensor_ops.creation_ops import empty, zeros
 from ...tensor_ops.multiary_ops import einsum
 from ...tensor_ops.shape_ops import flip, pad, pad_to_shape, pooling1d, pooling2d
 from ...tensors import ShapeError, Tensor
@@ -38,9 +38,7 @@ class Conv1DFunction(Function):
 
         f = Dilation1DFunction.forward(ctx, f, dilation)
         x = Pad1DFunction.forward(ctx, x, padding)
-        y = RawConv1DFunction.forward(ctx, x, f, stride)
-        if b:
-            y += b.view((*b.shape, 1))
+        y = RawConv1DFunction.forward(ctx, x, f, stride, b)
 
         ctx.add(b is not None)
         return y
@@ -182,11 +180,24 @@ class RawConv1DFunction(Function):
     """Computes the 1D convolution of two tensors."""
 
     @staticmethod
-    def forward(ctx: FunctionContext, x: Tensor, f: Tensor, stride: int) -> Tensor:
+    def forward(
+        ctx: FunctionContext,
+        x: Tensor,
+        f: Tensor,
+        stride: int,
+        b: Optional[Tensor] = None,
+    ) -> Tensor:
         x_pooled = pooling1d(x, f.shape[-1], stride)  # view as (B, Ci, So, F)
-        y = einsum("bitf,oif->bot", x_pooled, f).to_contiguous()  # multiply and add
+        y = einsum("bitf,oif->bot", x_pooled, f)  # multiply and add
         ctx.add(x, f, stride)
-        return y
+
+        if not b:
+            return y.to_contiguous()
+
+        # the bias is added while copying the result to contiguous memory
+        y_bias = empty(y.shape, device=y.device, dtype=y.dtype)
+        y.device.module.add(y.data, b.data.reshape((*b.shape, 1)), out=y_bias.data)
+        return y_bias
 
     @staticmethod
     def backward(ctx: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor]:
@@ -233,9 +244,7 @@ class Conv2DFunction(Function):
 
         f = Dilation2DFunction.forward(ctx, f, dilation)
         x = Pad2DFunction.forward(ctx, x, padding)
-        y = RawConv2DFunction.forward(ctx, x, f, stride)
-        if b:
-            y += b.view((*b.shape, 1, 1))
+        y = RawConv2DFunction.forward(ctx, x, f, stride, b)
 
         ctx.add(b is not None)
         return y
@@ -377,35 +386,44 @@ class RawConv2DFunction(Function):
     """Computes the 2D convolution of two tensors."""
 
     @staticmethod
-    def forward(ctx: FunctionContext, x: Tensor, f: Tensor, stride: int) -> Tensor:
+    def forward(
+        ctx: FunctionContext,
+        x: Tensor,
+        f: Tensor,
+        stride: int,
+        b: Optional[Tensor] = None,
+    ) -> Tensor:
         x_pooled = pooling2d(x, f.shape[-1], stride)  # view as (B, Ci, Y, X, Fy, Fx)
-        y = einsum("biyxjk,oijk->boyx", x_pooled, f).to_contiguous()  # multiply and add
+        y = einsum("biyxjk,oijk->boyx", x_pooled, f)  # multiply and add
         ctx.add(x, f, stride)
-        return y
+
+        if not b:
+            return y.to_contiguous()
+
+        # the bias is added while copying the result to contiguous memory
+        y_bias = empty(y.shape, device=y.device, dtype=y.dtype)
+        y.device.module.add(y.data, b.data.reshape((*b.shape, 1, 1)), out=y_bias.data)
+        return y_bias
 
     @staticmethod
     def backward(ctx: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor]:
         x, f, stride = ctx.get()
-
-        # fill elements skipped by strides with zeros
-        dy = dilate2d(dy, stride)
-
-        # pad to match unstrided dy
-        dy_t = x.shape[-1] - f.shape[-1] + 1
-        dy = pad_to_shape(dy, (*dy.shape[:-2], dy_t, dy_t))
-
-        # full pad
-        dy = pad2d(dy, f.shape[-1] - 1)
-
-        # input grads
-        dy_pooled = pooling2d(dy, f.shape[-1])  # view as (B, Co, Y, X, Fy, Fx)
-        f = flip(f, dim=(-2, -1))
-        dx = einsum("boyxjk,oijk->biyx", dy_pooled, f).to_contiguous()
+        f_size = f.shape[-1]
+        y_out, x_out = dy.shape[-2:]
+
+        # input grads, each filter offset adds its contribution to a strided slice,
+        # so dy does not need to be dilated and padded
+        dx = zeros(x.shape, device=x.device, dtype=dy.dtype)
+        for j in range(f_size):
+            for k in range(f_size):
+                dx_jk = einsum("boyx,oi->biyx", dy, f[:, :, j, k])
+                y_slice = slice(j, j + stride * y_out, stride)
+                x_slice = slice(k, k + stride * x_out, stride)
+                dx.data[:, :, y_slice, x_slice] += dx_jk.data
 
         # filter grads
-        dy_pooled = pooling2d(dy, x.shape[-1])  # view as (B, Co, Fy, Fx, Y, X)
-        df = einsum("bojkyx,biyx->oijk", dy_pooled, x)
-        df = flip(df, dim=(-2, -1)).to_contiguous()
+        x_pooled = pooling2d(x, f_size, stride)  # view as (B, Ci, Y, X, Fy, Fx)
+        df = einsum("boyx,biyxjk->oijk", dy, x_pooled).to_contiguous()
 
         return dx, df
 
@@ -1,6 +1,6 @@
 """Neural network embedding functions."""
 
-from ...preprocessing.basic import one_hot_encode
+from ...tensor_ops.creation_ops import zeros
 from ...tensors import Tensor
 from ...typing import is_integer
 from .functions import Function, FunctionContext, PseudoContext
@@ -15,16 +15,21 @@ class EmbeddingFunction(Function):
     def forward(ctx: FunctionContext, x: Tensor, embed_table: Tensor) -> Tensor:
         if not is_integer(x.dtype):
             raise ValueError(f"Input must be an integer, got '{x.dtype}'.")
-        y = embed_table[x]
+        y = Tensor(embed_table.data.take(x.data, axis=0))
         ctx.add(x, embed_table.shape[0])
         return y
 
     @staticmethod
     def backward(ctx: FunctionContext, dy: Tensor) -> Tensor:
         x, n_embs = ctx.get()
-        batch_dims = tuple(range(x.ndim - 1))
-        x = one_hot_encode(x, n_embs, dy.dtype)
-        return (x.T @ dy).sum(batch_dims)
+        embed_dim = dy.shape[-1]
+
+        # accumulate gradients of repeated indices instead of using a one-hot matmul
+        dw = zeros((n_embs, embed_dim), device=dy.device, dtype=dy.dtype)
+        dy.device.module.add.at(
+            dw.data, x.data.reshape(-1), dy.data.reshape(-1, embed_dim)
+        )
+        return dw
 
 
 def embedding(x: Tensor, embed_table: Tensor) -> Tensor:
@@ -29,8 +29,11 @@ class LinearFunction(Function):
         x, w, b = ctx.get()
 
         dx = dy @ w
-        dw = (dy.T @ x).sum(tuple(range(dy.ndim - 2)))
-        db = None if not b else dy.sum(tuple(range(dy.ndim - 1)))
+
+        # batch dims are collapsed, so weight grads are computed in a single matmul
+        dy = dy.view((-1, dy.shape[-1]))
+        dw = dy.T @ x.view((-1, x.shape[-1]))
+        db = None if not b else dy.sum(0)
 
         return dx, dw, db
 
@@ -1,13 +1,17 @@
 """Neural network loss functions."""
 
 import math
+import warnings
+from typing import Optional
 
 from ...preprocessing.basic import one_hot_encode
+from ...tensor_ops.creation_ops import arange
 from ...tensor_ops.selection_ops import maximum
 from ...tensor_ops.unary_ops import abs as _abs
-from ...tensor_ops.unary_ops import exp, log
+from ...tensor_ops.unary_ops import exp, log, log1p
 from ...tensors import ShapeError, Tensor
-from .activation_funcs import SoftmaxFunction, sigmoid, softmax
+from ...typing import int64
+from .activation_funcs import SoftmaxFunction, sigmoid
 from .functions import Function, FunctionContext, PseudoContext
 
 __all__ = ["mse_loss", "cross_entropy_loss", "bce_loss", "dice_loss"]
@@ -55,22 +59,40 @@ class CrossEntropyLossFunction(Function):
     """Computes the cross entropy loss from logits."""
 
     @staticmethod
-    def forward(
-        ctx: FunctionContext, logits: Tensor, targets: Tensor, eta: float
-    ) -> Tensor:
-        probs = softmax(logits)
-        targets = one_hot_encode(targets, logits.shape[-1], probs.dtype)
-        loss = -(log(probs + eta) * targets).sum(-1).mean()
-        ctx.add(targets, probs)
+    def forward(ctx: FunctionContext, logits: Tensor, targets: Tensor) -> Tensor:
+        # log-softmax is computed directly, so no log of probabilities is needed
+        x = logits - logits.max(-1, keepdims=True)
+        exp_x = exp(x)
+        exp_x_sum = exp_x.sum(-1, keepdims=True)
+        log_probs = x - log(exp_x_sum)
+
+        # gather target log-probabilities instead of multiplying with one-hot targets
+        n = targets.size
+        batch_idx = arange(n, device=logits.device, dtype=int64)
+        targets = targets.view((n,))
+        loss = -log_probs.view((n, -1))[batch_idx, targets].mean()
+
+        ctx.add(batch_idx, targets, exp_x / exp_x_sum)
         return loss
 
     @staticmethod
     def backward(ctx: FunctionContext) -> Tensor:
-        targets, probs = ctx.get()
-        return (probs - targets) / float(math.prod(targets.shape[:-1]))
+        batch_idx, targets, probs = ctx.get()
+        n = len(targets)
+
+        # the cached probabilities are not used elsewhere and are updated in place
+        dlogits = probs
+        dlogits /= float(n)
 
+        # only the target entries of the one-hot term are nonzero, so they are
+        # subtracted directly instead of subtracting a dense one-hot tensor
+        dlogits.data.reshape(n, -1)[batch_idx.data, targets.data] -= 1.0 / n
+        return dlogits
 
-def cross_entropy_loss(logits: Tensor, targets: Tensor, eta: float = 1e-8) -> Tensor:
+
+def cross_entropy_loss(
+    logits: Tensor, targets: Tensor, eta: Optional[float] = None
+) -> Tensor:
     """Computes the cross entropy loss from logits.
 
     Parameters
@@ -80,8 +102,8 @@ def cross_entropy_loss(logits: Tensor, targets: Tensor, eta: float = 1e-8) -> Te
     targets : Tensor
         Target class labels, must be of type ``int``.
     eta : float, optional
-        A small constant added for numerical stability. Defaults to ``1e-8``.
-
+        Deprecated and ignored. The loss is computed from log-softmax values, which
+        do not need a constant for numerical stability. Defaults to ``None``.
 
     Returns
     -------
@@ -92,7 +114,11 @@ def cross_entropy_loss(logits: Tensor, targets: Tensor, eta: float = 1e-8) -> Te
     --------
     :class:`compyute.nn.CrossEntropyLoss`
     """
-    return CrossEntropyLossFunction.forward(PseudoContext(), logits, targets, eta)
+    if eta is not None:
+        warnings.warn(
+            "The eta argument is deprecated and ignored.", DeprecationWarning, 2
+        )
+    return CrossEntropyLossFunction.forward(PseudoContext(), logits, targets)
 
 
 class BCELossFunction(Function):
@@ -100,15 +126,20 @@ class BCELossFunction(Function):
 
     @staticmethod
     def forward(ctx: FunctionContext, logits: Tensor, targets: Tensor) -> Tensor:
-        max_logits = maximum(logits, 0.0)
-        loss = (max_logits - logits * targets + log(1 + exp(-_abs(logits)))).mean()
+        # accumulate terms in place to avoid a temporary per operation
+        losses = maximum(logits, 0.0)
+        losses -= logits * targets
+        losses += log1p(exp(-_abs(logits)))
         ctx.add(logits, targets)
-        return loss
+        return losses.mean()
 
     @staticmethod
     def backward(ctx: FunctionContext) -> Tensor:
         logits, targets = ctx.get()
-        return (sigmoid(logits) - targets) / float(logits.size)  # thank you ChatGPT
+        dlogits = sigmoid(logits)  # thank you ChatGPT
+        dlogits -= targets
+        dlogits /= float(logits.size)
+        return dlogits
 
 
 def bce_loss(logits: Tensor, targets: Tensor) -> Tensor:
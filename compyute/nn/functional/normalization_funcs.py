@@ -1,11 +1,205 @@
 """Neural network normalization functions."""
 
+import math
+from typing import Any
+
+import numpy
+
+from ...backend import cpu
+from ...tensor_ops.creation_ops import empty, empty_like, zeros
 from ...tensor_ops.unary_ops import sqrt
 from ...tensors import ShapeError, Tensor
+from ...typing import DType, float16, float32, int8
 from .functions import Function, FunctionContext, PseudoContext
 
 __all__ = ["batchnorm1d", "batchnorm2d", "layernorm", "rmsnorm"]
 
+# Fused layernorm kernels for the GPU. Rows of the input are normalized by one block
+# each, reductions over a row use warp shuffles and one shared memory slot per warp.
+# Values are stored as T and affine parameters as W, but all arithmetic is done in
+# float32. Affine parameters quantized to int8 are dequantized in registers using
+# their scales.
+_LAYERNORM_KERNEL_SOURCE = r"""
+__device__ float block_sum(float v, float* shared) {
+    for (int offset = 16; offset > 0; offset >>= 1)
+        v += __shfl_down_sync(0xffffffff, v, offset);
+
+    const int lane = threadIdx.x & 31;
+    const int warp = threadIdx.x >> 5;
+    __syncthreads();  // shared memory may still be read from a previous reduction
+    if (lane == 0) shared[warp] = v;
+    __syncthreads();
+
+    if (warp == 0) {
+        v = threadIdx.x < (blockDim.x >> 5) ? shared[lane] : 0.0f;
+        for (int offset = 16; offset > 0; offset >>= 1)
+            v += __shfl_down_sync(0xffffffff, v, offset);
+        if (lane == 0) shared[0] = v;
+    }
+    __syncthreads();
+    return shared[0];
+}
+
+extern "C" __global__ void layernorm_forward(
+    const T* x, const W* w, const W* b, T* y, float* mean, float* rstd,
+    const int d, const float eps, const float w_scale, const float b_scale
+) {
+    __shared__ float shared[32];
+    const long long offset = (long long)blockIdx.x * d;
+
+    float sum = 0.0f;
+    for (int j = threadIdx.x; j < d; j += blockDim.x) sum += (float)x[offset + j];
+    const float mu = block_sum(sum, shared) / d;
+
+    float sq_sum = 0.0f;
+    for (int j = threadIdx.x; j < d; j += blockDim.x) {
+        const float diff = (float)x[offset + j] - mu;
+        sq_sum += diff * diff;
+    }
+    const float rs = rsqrtf(block_sum(sq_sum, shared) / d + eps);
+
+    for (int j = threadIdx.x; j < d; j += blockDim.x) {
+        const float x_norm = ((float)x[offset + j] - mu) * rs;
+        y[offset + j] = T(x_norm * (float)w[j] * w_scale + (float)b[j] * b_scale);
+    }
+
+    if (threadIdx.x == 0) {
+        mean[blockIdx.x] = mu;
+        rstd[blockIdx.x] = rs;
+    }
+}
+
+extern "C" __global__ void layernorm_backward_input(
+    const T* dy, const T* x, const W* w, const float* mean,
+    const float* rstd, T* dx, const int d
+) {
+    __shared__ float shared[32];
+    const long long offset = (long long)blockIdx.x * d;
+    const float mu = mean[blockIdx.x];
+    const float rs = rstd[blockIdx.x];
+
+    float g_sum = 0.0f;
+    float g_x_norm_sum = 0.0f;
+    for (int j = threadIdx.x; j < d; j += blockDim.x) {
+        const float g = (float)dy[offset + j] * (float)w[j];
+        g_sum += g;
+        g_x_norm_sum += g * ((float)x[offset + j] - mu) * rs;
+    }
+    g_sum = block_sum(g_sum, shared);
+    g_x_norm_sum = block_sum(g_x_norm_sum, shared);
+
+    for (int j = threadIdx.x; j < d; j += blockDim.x) {
+        const float g = (float)dy[offset + j] * (float)w[j];
+        const float x_norm = ((float)x[offset + j] - mu) * rs;
+        dx[offset + j] = T(rs * (g - (g_sum + x_norm * g_x_norm_sum) / d));
+    }
+}
+
+extern "C" __global__ void layernorm_backward_params(
+    const T* dy, const T* x, const float* mean, const float* rstd,
+    float* dw, float* db, const int n, const int d, const int rows_per_block
+) {
+    // consecutive threads handle consecutive columns, so loads are coalesced
+    const int col = blockIdx.x * blockDim.x + threadIdx.x;
+    if (col >= d) return;
+
+    // the grid is limited in y, so blocks loop over tiles of rows
+    float dw_sum = 0.0f;
+    float db_sum = 0.0f;
+    for (long long tile = blockIdx.y; tile * rows_per_block < n; tile += gridDim.y) {
+        const int row_start = (int)(tile * rows_per_block);
+        const int row_end = min(row_start + rows_per_block, n);
+        for (int row = row_start; row < row_end; ++row) {
+            const long long i = (long long)row * d + col;
+            const float dy_i = (float)dy[i];
+            dw_sum += dy_i * ((float)x[i] - mean[row]) * rstd[row];
+            db_sum += dy_i;
+        }
+    }
+    atomicAdd(dw + col, dw_sum);
+    atomicAdd(db + col, db_sum);
+}
+"""
+_LAYERNORM_STORAGE_TYPES = {
+    float16.name: "#include <cuda_fp16.h>\ntypedef __half T;\n",
+    float32.name: "typedef float T;\n",
+}
+_LAYERNORM_PARAM_TYPES = {int8.name: "typedef signed char W;\n"}
+_BLOCK_SIZE = 256
+_ROWS_PER_BLOCK = 64
+_MAX_GRID_DIM_Y = 65535
+_kernel_modules: dict[Any, Any] = {}
+
+
+def _get_layernorm_kernel(x: Tensor, w: Tensor, name: str) -> Any:
+    key = (x.device.module, x.dtype.name, w.dtype.name)
+    if key not in _kernel_modules:
+        code = (
+            _LAYERNORM_STORAGE_TYPES[x.dtype.name]
+            + _LAYERNORM_PARAM_TYPES.get(w.dtype.name, "typedef T W;\n")
+            + _LAYERNORM_KERNEL_SOURCE
+        )
+        _kernel_modules[key] = x.device.module.RawModule(code=code)
+    return _kernel_modules[key].get_function(name)
+
+
+def _is_param_type(x: Tensor, w: Tensor, b: Tensor) -> bool:
+    # affine parameters are either of the input type or quantized to int8
+    return w.dtype == b.dtype and w.dtype in (x.dtype, int8)
+
+
+def _dequantize(q: Tensor, scale: float, dtype: DType) -> Tensor:
+    if q.dtype != int8:
+        return q
+    return q.to_type(dtype) * scale
+
+
+_batchnorm_kernels: dict[Any, Any] = {}
+
+
+def _batchnorm_affine(
+    x: Tensor,
+    mean: Tensor,
+    rstd: Tensor,
+    w: Tensor,
+    b: Tensor,
+    w_scale: float,
+    b_scale: float,
+) -> tuple[Tensor, Tensor]:
+    if (
+        x.device != cpu
+        and x.dtype == mean.dtype == rstd.dtype
+        and _is_param_type(x, w, b)
+    ):
+        # normalize, scale and shift in a single pass over the input, the arithmetic
+        # is done in float32 also for float16 tensors
+        module = x.device.module
+        if module not in _batchnorm_kernels:
+            _batchnorm_kernels[module] = module.ElementwiseKernel(
+                "T x, T mean, T rstd, W w, W b, float32 w_scale, float32 b_scale",
+                "T x_norm, T y",
+                """
+                float x_norm_f = ((float)x - (float)mean) * (float)rstd;
+                x_norm = (T)x_norm_f;
+                y = (T)(x_norm_f * (float)w * w_scale + (float)b * b_scale);
+                """,
+                "batchnorm_affine",
+            )
+        x_norm, y = _batchnorm_kernels[module](
+            x.data, mean.data, rstd.data, w.data, b.data, w_scale, b_scale
+        )
+        return Tensor(x_norm), Tensor(y)
+
+    w = _dequantize(w, w_scale, x.dtype)
+    b = _dequantize(b, b_scale, x.dtype)
+
+    # accumulate in place to avoid a temporary per operation
+    x_norm = x - mean
+    x_norm *= rstd
+    y = x_norm * w
+    y += b
+    return x_norm, y
+
 
 class BatchNorm1DFunction(Function):
     """Performs 1D batch normalization on a tensor."""
@@ -21,7 +215,9 @@ class BatchNorm1DFunction(Function):
         m: float,
         eps: float,
         training: bool,
-    ) -> tuple[Tensor, Tensor, Tensor]:
+        w_scale: float = 1.0,
+        b_scale: float = 1.0,
+    ) -> Tensor:
         if x.ndim not in {2, 3}:
             raise ShapeError(f"Expected input to be 2D or 3D, got {x.ndim}D.")
 
@@ -29,37 +225,43 @@ class BatchNorm1DFunction(Function):
         batch_dims: tuple[int, ...] = (0,) if x.ndim == 2 else (0, 2)
 
         if training:
+            n = x.size // x.shape[1]
+            if n < 2:
+                raise ValueError(f"Expected more than 1 value per channel, got {n}.")
+
             # compute mean and variance from x
             mean = x.mean(batch_dims, keepdims=True)
-            std = sqrt(x.var(batch_dims, keepdims=True) + eps)
-            x_norm = (x - mean) / std
-
-            # keep running stats
-            rmean = rmean * (1 - m) + mean.squeeze() * m
-            rvar = rvar * (1 - m) + x.var(batch_dims, ddof=1) * m
+            var = x.var(batch_dims, keepdims=True)
+            rstd = 1.0 / sqrt(var + eps)
+
+            # update running stats in place, the unbiased variance is derived from the
+            # biased one
+            rmean *= 1 - m
+            rmean += mean.squeeze() * m
+            rvar *= 1 - m
+            rvar += var.squeeze() * (n / (n - 1) * m)
         else:
             # use running mean and variance
             var = rvar if x_is_2d else rvar.view((*rvar.shape, 1))
             mean = rmean if x_is_2d else rmean.view((*rmean.shape, 1))
-            std = sqrt(var + eps)
-            x_norm = (x - mean) / std
+            rstd = 1.0 / sqrt(var + eps)
 
         w = w if x_is_2d else w.view((*w.shape, 1))
         b = b if x_is_2d else b.view((*b.shape, 1))
-        y = w * x_norm + b
+        x_norm, y = _batchnorm_affine(x, mean, rstd, w, b, w_scale, b_scale)
 
-        ctx.add(w, batch_dims, std, x_norm)
-        return y, rmean, rvar
+        ctx.add(w, batch_dims, rstd, x_norm)
+        return y
 
     @staticmethod
     def backward(ctx: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor, Tensor]:
-        w, batch_dims, std, x_norm = ctx.get()
+        w, batch_dims, rstd, x_norm = ctx.get()
         n = float(dy.size / dy.shape[1])
 
         # input grads
         dy_sum = dy.sum(batch_dims, keepdims=True)
         dy_x_norm_sum = (dy * x_norm).sum(batch_dims, keepdims=True)
-        dx = w / (std * n) * (n * dy - dy_sum - x_norm * dy_x_norm_sum)
+        dx = w * rstd / n * (n * dy - dy_sum - x_norm * dy_x_norm_sum)
 
         # gamma grads
         dw = dy_x_norm_sum.squeeze()
@@ -79,7 +281,7 @@ def batchnorm1d(
     m: float = 0.1,
     eps: float = 1e-5,
     training: bool = False,
-) -> tuple[Tensor, Tensor, Tensor]:
+) -> Tensor:
     """Performs 1D batch normalization on a tensor.
 
     Parameters
@@ -87,9 +289,9 @@ def batchnorm1d(
     x : Tensor
         Input tensor.
     rmean : Tensor
-        Running mean tensor.
+        Running mean tensor. Updated in place in training mode.
     rvar : Tensor
-        Running variance tensor.
+        Running variance tensor. Updated in place in training mode.
     w : Tensor
         Weight tensor for scaling the distribution.
     b : Tensor
@@ -105,10 +307,6 @@ def batchnorm1d(
     -------
     Tensor
         Output tensor.
-    Tensor
-        New running mean.
-    Tensor
-        New running variance.
 
     See Also
     ----------
@@ -133,42 +331,50 @@ class BatchNorm2DFunction(Function):
         m: float,
         eps: float,
         training: bool,
-    ) -> tuple[Tensor, Tensor, Tensor]:
+        w_scale: float = 1.0,
+        b_scale: float = 1.0,
+    ) -> Tensor:
         if x.ndim != 4:
             raise ShapeError(f"Expected input to be 4D, got {x.ndim}D.")
         batch_dims = (0, 2, 3)
 
         if training:
+            n = x.size // x.shape[1]
+            if n < 2:
+                raise ValueError(f"Expected more than 1 value per channel, got {n}.")
+
             # compute mean and variance from x
             mean = x.mean(batch_dims, keepdims=True)
-            std = sqrt(x.var(batch_dims, keepdims=True) + eps)
-            x_norm = (x - mean) / std
-
-            # keep running stats
-            rmean = rmean * (1 - m) + mean.squeeze() * m
-            rvar = rvar * (1 - m) + x.var(batch_dims, ddof=1) * m
+            var = x.var(batch_dims, keepdims=True)
+            rstd = 1.0 / sqrt(var + eps)
+
+            # update running stats in place, the unbiased variance is derived from the
+            # biased one
+            rmean *= 1 - m
+            rmean += mean.squeeze() * m
+            rvar *= 1 - m
+            rvar += var.squeeze() * (n / (n - 1) * m)
         else:
             # use running mean and variance
             mean = rmean.view((*rmean.shape, 1, 1))
-            std = sqrt(rvar.view((*rvar.shape, 1, 1)) + eps)
-            x_norm = (x - mean) / std
+            rstd = 1.0 / sqrt(rvar.view((*rvar.shape, 1, 1)) + eps)
 
         w = w.view((*w.shape, 1, 1))
         b = b.view((*b.shape, 1, 1))
-        y = w * x_norm + b
+        x_norm, y = _batchnorm_affine(x, mean, rstd, w, b, w_scale, b_scale)
 
-        ctx.add(w, batch_dims, std, x_norm)
-        return y, rmean, rvar
+        ctx.add(w, batch_dims, rstd, x_norm)
+        return y
 
     @staticmethod
     def backward(ctx: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor, Tensor]:
-        w, batch_dims, std, x_norm = ctx.get()
+        w, batch_dims, rstd, x_norm = ctx.get()
         n = float(dy.size / dy.shape[1])
 
         # input grads
         dy_sum = dy.sum(batch_dims, keepdims=True)
         dy_x_norm_sum = (dy * x_norm).sum(batch_dims, keepdims=True)
-        dx = w / (std * n) * (n * dy - dy_sum - x_norm * dy_x_norm_sum)
+        dx = w * rstd / n * (n * dy - dy_sum - x_norm * dy_x_norm_sum)
 
         # gamma grads
         dw = dy_x_norm_sum.squeeze()
@@ -188,7 +394,7 @@ def batchnorm2d(
     m: float = 0.1,
     eps: float = 1e-5,
     training: bool = False,
-) -> tuple[Tensor, Tensor, Tensor]:
+) -> Tensor:
     """Performs 2D batch normalization on a tensor.
 
     Parameters
@@ -196,9 +402,9 @@ def batchnorm2d(
     x : Tensor
         Input tensor.
     rmean : Tensor
-        Running mean values.
+        Running mean values. Updated in place in training mode.
     rvar : Tensor
-        Running variance values.
+        Running variance values. Updated in place in training mode.
     w : Tensor
         Weight tensor for scaling the distribution.
     b : Tensor
@@ -214,10 +420,6 @@ def batchnorm2d(
     -------
     Tensor
         Output tensor.
-    Tensor
-        New running mean.
-    Tensor
-        New running variance.
 
     See Also
     ----------
@@ -233,8 +435,41 @@ class LayerNormFunction(Function):
 
     @staticmethod
     def forward(
-        ctx: FunctionContext, x: Tensor, w: Tensor, b: Tensor, eps: float
+        ctx: FunctionContext,
+        x: Tensor,
+        w: Tensor,
+        b: Tensor,
+        eps: float,
+        w_scale: float = 1.0,
+        b_scale: float = 1.0,
     ) -> Tensor:
+        if (
+            x.device != cpu
+            and _is_param_type(x, w, b)
+            and x.dtype.name in _LAYERNORM_STORAGE_TYPES
+        ):
+            x, w, b = x.to_contiguous(), w.to_contiguous(), b.to_contiguous()
+            d = w.size
+            n = x.size // d
+            y = empty_like(x)
+            mean = empty((n,), device=x.device, dtype=float32)
+            rstd = empty((n,), device=x.device, dtype=float32)
+
+            kernel = _get_layernorm_kernel(x, w, "layernorm_forward")
+            kernel(
+                (n,),
+                (_BLOCK_SIZE,),
+                (x.data, w.data, b.data, y.data, mean.data, rstd.data)
+                + (numpy.int32(d), numpy.float32(eps))
+                + (numpy.float32(w_scale), numpy.float32(b_scale)),
+            )
+
+            ctx.add(x, w, mean, rstd)
+            ctx.add(True)
+            return y
+
+        w = _dequantize(w, w_scale, x.dtype)
+        b = _dequantize(b, b_scale, x.dtype)
         feat_dims = tuple(-i - 1 for i in range(w.ndim))
 
         mean = x.mean(feat_dims, keepdims=True)
@@ -243,28 +478,66 @@ class LayerNormFunction(Function):
         y = w * x_norm + b
 
         ctx.add(w, feat_dims, std, x_norm)
+        ctx.add(False)
         return y
 
     @staticmethod
-    def backward(ctc: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor, Tensor]:
-        w, feat_dims, std, x_norm = ctc.get()
+    def backward(ctx: FunctionContext, dy: Tensor) -> tuple[Tensor, Tensor, Tensor]:
+        if ctx.get():
+            return LayerNormFunction._fused_backward(ctx, dy)
+
+        w, feat_dims, std, x_norm = ctx.get()
         batch_dims = tuple(range(dy.ndim - w.ndim))
         n = w.size
 
         # input grads
-        dy_sum = dy.sum(feat_dims, keepdims=True)
-        dy_x_norm = dy * x_norm
-        dy_x_norm_sum = dy_x_norm.sum(feat_dims, keepdims=True)
-        dx = w / (std * n) * (n * dy - dy_sum - x_norm * dy_x_norm_sum)
+        dy_w = dy * w
+        dy_w_sum = dy_w.sum(feat_dims, keepdims=True)
+        dy_w_x_norm_sum = (dy_w * x_norm).sum(feat_dims, keepdims=True)
+        dx = (n * dy_w - dy_w_sum - x_norm * dy_w_x_norm_sum) / (std * n)
 
         # gamma grads
-        dw = dy_x_norm.sum(batch_dims)
+        dw = (dy * x_norm).sum(batch_dims)
 
         # beta grads
         db = dy.sum(batch_dims)
 
         return dx, dw, db
 
+    @staticmethod
+    def _fused_backward(
+        ctx: FunctionContext, dy: Tensor
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        x, w, mean, rstd = ctx.get()
+        dy = dy.to_contiguous()
+        d = w.size
+        n = x.size // d
+
+        # input grads
+        dx = empty_like(x)
+        kernel = _get_layernorm_kernel(x, w, "layernorm_backward_input")
+        kernel(
+            (n,),
+            (_BLOCK_SIZE,),
+            (dy.data, x.data, w.data, mean.data, rstd.data, dx.data, numpy.int32(d)),
+        )
+
+        # gamma and beta grads, accumulated in float32
+        dw = zeros(w.shape, device=w.device, dtype=float32)
+        db = zeros(w.shape, device=w.device, dtype=float32)
+        kernel = _get_layernorm_kernel(x, w, "layernorm_backward_params")
+        kernel(
+            (
+                math.ceil(d / _BLOCK_SIZE),
+                min(math.ceil(n / _ROWS_PER_BLOCK), _MAX_GRID_DIM_Y),
+            ),
+            (_BLOCK_SIZE,),
+            (dy.data, x.data, mean.data, rstd.data, dw.data, db.data)
+            + (numpy.int32(n), numpy.int32(d), numpy.int32(_ROWS_PER_BLOCK)),
+        )
+
+        return dx, dw.to_type(w.dtype), db.to_type(w.dtype)
+
 
 def layernorm(x: Tensor, w: Tensor, b: Tensor, eps: float = 1e-5) -> Tensor:
     """Performs layer normalization on a tensor.
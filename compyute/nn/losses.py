@@ -4,10 +4,11 @@ from __future__ import annotations
 
 import os
 import time
+import warnings
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from functools import wraps
-from typing import Literal
+from typing import Literal, Optional
 
 from ..tensor_ops.unary_ops import is_nan
 from ..tensors import Tensor
@@ -143,8 +144,14 @@ class CrossEntropyLoss(Loss):
     """
 
     @Loss.register_forward
-    def forward(self, logits: Tensor, targets: Tensor, eta: float = 1e-8) -> Tensor:
-        return CrossEntropyLossFunction.forward(self.function_ctx, logits, targets, eta)
+    def forward(
+        self, logits: Tensor, targets: Tensor, eta: Optional[float] = None
+    ) -> Tensor:
+        if eta is not None:  # deprecated, log-softmax values need no offset
+            warnings.warn(
+                "The eta argument is deprecated and ignored.", DeprecationWarning, 2
+            )
+        return CrossEntropyLossFunction.forward(self.function_ctx, logits, targets)
 
     @Loss.register_backward
     def backward(self) -> Tensor:
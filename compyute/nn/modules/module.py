@@ -61,12 +61,22 @@ class Module(ABC):
         device : Device
             Device to move the module parameters and variables to.
         """
-        for t in vars(self).values():
-            if isinstance(t, Tensor):
+        tensors: list[Tensor] = []
+        for module in (self, *self.get_modules()):
+            tensors.extend(module._parameters.values())
+            tensors.extend(module._buffers.values())
+            tensors.extend(t for t in (module.x, module.y) if t is not None)
+
+        if device == cpu:
+            for t in tensors:
                 t.ito_device(device)
+            return
 
-        for module in self.get_modules(recursive=False):
-            module.to_device(device)
+        # copies are issued on one non-blocking stream and synchronized once
+        with device, device.module.cuda.Stream(non_blocking=True) as stream:
+            for t in tensors:
+                t.ito_device(device)
+            stream.synchronize()
 
     @property
     def dtype(self) -> DType:
@@ -84,8 +94,12 @@ class Module(ABC):
         dtype : DType
             DType to cast module parameters and variables to.
         """
-        for t in vars(self).values():
-            if isinstance(t, Tensor):
+        for p in self._parameters.values():
+            p.ito_type(dtype)
+        for b in self._buffers.values():
+            b.ito_type(dtype)
+        for t in (self.x, self.y):  # retained values, consistent with to_device
+            if t is not None:
                 t.ito_type(dtype)
 
         for module in self.get_modules(recursive=False):
@@ -93,7 +107,8 @@ class Module(ABC):
 
     @property
     def retain_values(self) -> bool:
-        """Whether the module should retain intermediate values such as outputs and gradients."""
+        """Whether the module should retain intermediate values such as outputs and gradients.
+        Values are retained as references to the tensors, not as copies."""
         return self._retain_values
 
     @retain_values.setter
@@ -137,7 +152,7 @@ class Module(ABC):
     @property
     def n_modules(self) -> int:
         """Number of child modules."""
-        return len(list(self.get_modules(recursive=False)))
+        return len(self._modules)
 
     # ----------------------------------------------------------------------------------
     # MAGIC METHODS
@@ -177,10 +192,16 @@ class Module(ABC):
         Iterator[Module]
             Child modules.
         """
-        for m in self._modules.values():
+        if not recursive:
+            yield from self._modules.values()
+            return
+
+        # walk the module tree with a stack instead of nesting a generator per level
+        stack = list(reversed(self._modules.values()))
+        while stack:
+            m = stack.pop()
             yield m
-            if recursive:
-                yield from m.get_modules()
+            stack.extend(reversed(m._modules.values()))
 
     def get_parameters(self, recursive: bool = True) -> Iterator[Parameter]:
         """Returns an Iterator of module parameters.
@@ -195,11 +216,10 @@ class Module(ABC):
         Iterator[Parameter]
             Iterator of parameters.
         """
-        for p in self._parameters.values():
-            yield p
+        yield from self._parameters.values()
         if recursive:
             for m in self.get_modules():
-                yield from m.get_parameters(recursive=False)
+                yield from m._parameters.values()
 
     def get_buffers(self, recursive: bool = True) -> Iterator[Buffer]:
         """Returns an Iterator of module buffers.
@@ -214,11 +234,10 @@ class Module(ABC):
         Iterator[Buffer]
             Iterator of buffers.
         """
-        for b in self._buffers.values():
-            yield b
+        yield from self._buffers.values()
         if recursive:
             for m in self.get_modules():
-                yield from m.get_buffers(recursive=False)
+                yield from m._buffers.values()
 
     def _get_pointer_state_dict(self) -> OrderedDict[str, Tensor]:
         """Returns a state dict containing pointers to module parameters and buffers."""
@@ -327,7 +346,8 @@ class Module(ABC):
 
             assert not is_nan(y).any().item(), "NaNs detected in " + repr(m)
 
-            if m.retain_values:
+            # the flag is read directly to avoid a property call on every step
+            if m._retain_values:
                 m.x = x
                 m.y = y
 
@@ -355,7 +375,7 @@ class Module(ABC):
             assert not is_nan(dx).any().item(), "NaNs detected in " + repr(m)
             assert not m.function_ctx.context, "Context not cleared in " + repr(m)
 
-            if m.retain_values and m.x and m.y:
+            if m._retain_values and m.x is not None and m.y is not None:
                 m.x.grad = dx
                 m.y.grad = dy
 
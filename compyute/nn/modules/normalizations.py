@@ -1,9 +1,12 @@
 """Neural network normalization modules."""
 
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 from ...tensor_ops.creation_ops import ones, zeros
+from ...tensor_ops.unary_ops import clip
+from ...tensor_ops.unary_ops import round as _round
 from ...tensors import ShapeLike, Tensor
+from ...typing import int8
 from ..functional.normalization_funcs import (
     BatchNorm1DFunction,
     BatchNorm2DFunction,
@@ -16,7 +19,84 @@ from .module import Module
 __all__ = ["BatchNorm1D", "BatchNorm2D", "LayerNorm", "RMSNorm"]
 
 
-class BatchNorm1D(Module):
+class _QuantizedParams(NamedTuple):
+    w_id: int
+    b_id: int
+    w_q: Tensor
+    b_q: Tensor
+    w_scale: float
+    b_scale: float
+
+
+def _quantize(x: Tensor) -> tuple[Tensor, float]:
+    # symmetric quantization, the largest absolute value is mapped to 127
+    scale = x.abs().max().item() / 127 or 1.0
+    return clip(_round(x / scale, 0), -128, 127).to_type(int8), scale
+
+
+class _AffineNorm(Module):
+    """Base class for normalization modules with weights and biases that can be
+    quantized for inference."""
+
+    w: Parameter
+    b: Parameter
+
+    def __init__(self, label: Optional[str] = None) -> None:
+        super().__init__(label)
+        self._is_quantized = False
+        self._quantized: Optional[_QuantizedParams] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # quantized values are derived from the parameters, so they are not saved
+        state = self.__dict__.copy()
+        state["_quantized"] = None
+        return state
+
+    def training(self) -> None:
+        super().training()
+        self._is_quantized = False
+        self._quantized = None
+
+    def quantize(self) -> None:
+        """Quantizes weights and biases to int8 using symmetric scales.
+
+        While the module is in inference mode, the quantized values are used instead
+        of the weights and biases. Switching to training mode discards them.
+        Weights and biases that are modified in place afterwards have to be
+        quantized again.
+
+        Raises
+        ------
+        AttributeError
+            If the module is in training mode.
+        """
+        if self._is_training:
+            raise AttributeError(f"{self.label} is not in inference mode.")
+        self._is_quantized = True
+        self._quantize_affine_params()
+
+    def _quantize_affine_params(self) -> None:
+        # quantized values are not registered as buffers, so they are neither cast
+        # nor saved, the ids of the source arrays are kept to detect replaced ones
+        w_q, w_scale = _quantize(self.w)
+        b_q, b_scale = _quantize(self.b)
+        self._quantized = _QuantizedParams(
+            id(self.w.data), id(self.b.data), w_q, b_q, w_scale, b_scale
+        )
+
+    def _get_affine_params(self) -> tuple[Tensor, Tensor, float, float]:
+        if not self._is_quantized or self._is_training:
+            return self.w, self.b, 1.0, 1.0
+
+        # parameters that were cast, moved or loaded since are quantized again
+        q = self._quantized
+        if q is None or q.w_id != id(self.w.data) or q.b_id != id(self.b.data):
+            self._quantize_affine_params()
+            q = self._quantized
+        return q.w_q, q.b_q, q.w_scale, q.b_scale
+
+
+class BatchNorm1D(_AffineNorm):
     r"""Implements Batch Normalization as described by
     `Ioffe et al., 2015 <https://asvk.cs.msu.ru/~sveta/%D1%80%D0%B5%D1%84%D0%B5%D1%80%D0%B0%D1%82/batch_normalization.pdf>`_.
 
@@ -49,6 +129,8 @@ class BatchNorm1D(Module):
     .. note::
         Weights are initialized as ones, biases as zeros.
         The running means are initialized as zeros, the running variances as ones.
+        For inference, weights and biases can be quantized to int8 using
+        :meth:`quantize`.
     """
 
     def __init__(
@@ -63,28 +145,30 @@ class BatchNorm1D(Module):
         self.eps = eps
         self.m = m
 
-        # init parameters and buffers
-        self.w = Parameter(ones((channels,)))
-        self.b = Parameter(zeros((channels,)))
-        self.rmean = Buffer(zeros((channels,)))
-        self.rvar = Buffer(ones((channels,)))
+        # init parameters and buffers as rows of a single allocation
+        values = zeros((4, channels))
+        values[::3] = 1.0  # weights and running variances
+        self.w = Parameter(values[0])
+        self.b = Parameter(values[1])
+        self.rmean = Buffer(values[2])
+        self.rvar = Buffer(values[3])
 
     @Module.register_forward
     def forward(self, x: Tensor) -> Tensor:
-        y, rmean, rvar = BatchNorm1DFunction.forward(
+        w, b, w_scale, b_scale = self._get_affine_params()
+        return BatchNorm1DFunction.forward(
             self.function_ctx,
             x,
             self.rmean,
             self.rvar,
-            self.w,
-            self.b,
+            w,
+            b,
             self.m,
             self.eps,
             self._is_training,
+            w_scale,
+            b_scale,
         )
-        self.rmean.data = rmean.data
-        self.rvar.data = rvar.data
-        return y
 
     def backward(self, dy: Tensor) -> Tensor:
         dx, dw, db = BatchNorm1DFunction.backward(self.function_ctx, dy)
@@ -93,7 +177,7 @@ class BatchNorm1D(Module):
         return dx
 
 
-class BatchNorm2D(Module):
+class BatchNorm2D(_AffineNorm):
     r"""Implements Batch Normalization as described by
     `Ioffe et al., 2015 <https://asvk.cs.msu.ru/~sveta/%D1%80%D0%B5%D1%84%D0%B5%D1%80%D0%B0%D1%82/batch_normalization.pdf>`_.
 
@@ -127,6 +211,8 @@ class BatchNorm2D(Module):
     .. note::
         Weights are initialized as ones, biases as zeros.
         The running means are initialized as zeros, the running variances as ones.
+        For inference, weights and biases can be quantized to int8 using
+        :meth:`quantize`.
     """
 
     def __init__(
@@ -141,28 +227,30 @@ class BatchNorm2D(Module):
         self.eps = eps
         self.m = m
 
-        # init parameters and buffers
-        self.w = Parameter(ones((channels,)))
-        self.b = Parameter(zeros((channels,)))
-        self.rmean = Buffer(zeros((channels,)))
-        self.rvar = Buffer(ones((channels,)))
+        # init parameters and buffers as rows of a single allocation
+        values = zeros((4, channels))
+        values[::3] = 1.0  # weights and running variances
+        self.w = Parameter(values[0])
+        self.b = Parameter(values[1])
+        self.rmean = Buffer(values[2])
+        self.rvar = Buffer(values[3])
 
     @Module.register_forward
     def forward(self, x: Tensor) -> Tensor:
-        y, rmean, rvar = BatchNorm2DFunction.forward(
+        w, b, w_scale, b_scale = self._get_affine_params()
+        return BatchNorm2DFunction.forward(
             self.function_ctx,
             x,
             self.rmean,
             self.rvar,
-            self.w,
-            self.b,
+            w,
+            b,
             self.m,
             self.eps,
             self._is_training,
+            w_scale,
+            b_scale,
         )
-        self.rmean.data = rmean.data
-        self.rvar.data = rvar.data
-        return y
 
     def backward(self, dy: Tensor) -> Tensor:
         dx, dw, db = BatchNorm2DFunction.backward(self.function_ctx, dy)
@@ -171,7 +259,7 @@ class BatchNorm2D(Module):
         return dx
 
 
-class LayerNorm(Module):
+class LayerNorm(_AffineNorm):
     r"""Implements Layer Normalization as described by
     `Ba et al., 2016 <https://arxiv.org/pdf/1607.06450>`_.
 
@@ -199,6 +287,8 @@ class LayerNorm(Module):
 
     .. note::
         Weights are initialized as ones, biases as zeros.
+        For inference, weights and biases can be quantized to int8 using
+        :meth:`quantize`.
     """
 
     def __init__(
@@ -217,7 +307,10 @@ class LayerNorm(Module):
 
     @Module.register_forward
     def forward(self, x: Tensor) -> Tensor:
-        return LayerNormFunction.forward(self.function_ctx, x, self.w, self.b, self.eps)
+        w, b, w_scale, b_scale = self._get_affine_params()
+        return LayerNormFunction.forward(
+            self.function_ctx, x, w, b, self.eps, w_scale, b_scale
+        )
 
     def backward(self, dy: Tensor) -> Tensor:
         dx, dw, db = LayerNormFunction.backward(self.function_ctx, dy)
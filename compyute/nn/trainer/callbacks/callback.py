@@ -19,6 +19,8 @@ class CallbackTrigger(Enum):
 class Callback(ABC):
     """Trainig callback base class."""
 
+    __slots__ = ()
+
     def on_run_start(self, trainer_cache: dict[str, Any]) -> None:
         """Does someting at the start of the training run.
 
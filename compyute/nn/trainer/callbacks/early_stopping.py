@@ -1,7 +1,10 @@
 """Early stopping callbacks."""
 
-from typing import Any
+from typing import Any, Optional
 
+import numpy
+
+from ....backend import cpu, pinned_empty
 from ...modules import Module
 from .callback import Callback
 
@@ -23,6 +26,18 @@ class EarlyStopping(Callback):
         Metric to consider. Defaults to ``loss``.
     """
 
+    __slots__ = (
+        "model",
+        "patience",
+        "use_best_params",
+        "target",
+        "best_epoch",
+        "best_loss",
+        "best_params",
+        "_epochs_since_best",
+        "_stream",
+    )
+
     def __init__(
         self,
         model: Module,
@@ -35,42 +50,76 @@ class EarlyStopping(Callback):
         self.use_best_params = use_best_params
         self.target = target
 
-        self._cache: dict[str, Any] = {
-            "best_epoch": 1,
-            "best_loss": float("inf"),
-            "history": [],
-        }
+        self.best_epoch = 1
+        self.best_loss = float("inf")
+        self.best_params: Optional[list[numpy.ndarray]] = None
+        self._epochs_since_best = 0
+        self._stream: Optional[Any] = None
 
     def on_epoch_end(self, trainer_cache: dict[str, Any]) -> None:
-        self._cache["history"].append(trainer_cache[self.target])
-        best_loss = self._cache["best_loss"]
+        loss = trainer_cache[self.target]
 
-        # record best loss
-        if self._cache["history"][-1] < best_loss:
-            self._cache["best_epoch"] = trainer_cache["t"]
-            self._cache["best_loss"] = self._cache["history"][-1]
+        # count epochs without improvement instead of rechecking the history
+        if loss < self.best_loss:
+            self.best_epoch = trainer_cache["t"]
+            self.best_loss = loss
+            self._epochs_since_best = 0
 
             # save best parameters
             if self.use_best_params:
-                self._cache["best_params"] = [
-                    p.copy() for p in self.model.get_parameters()
-                ]
+                self._save_best_params()
+        elif loss > self.best_loss:
+            self._epochs_since_best += 1
+        else:
+            self._epochs_since_best = 0
 
-        if len(self._cache["history"]) <= self.patience:
+        if self._epochs_since_best < self.patience:
             return
 
-        # check if loss has decreased
-        if all(
-            self._cache["history"][-i] > best_loss for i in range(1, self.patience + 1)
-        ):
-            msg = f"Early stopping: no improvement over last {self.patience} epochs."
+        msg = f"Early stopping: no improvement over last {self.patience} epochs."
 
-            # reset model parameters to best epoch
-            if self.use_best_params:
-                best_epoch = self._cache["best_epoch"]
-                msg += f" Resetting parameters best epoch {best_epoch}."
-                for i, p in enumerate(self.model.get_parameters()):
-                    p.data = self._cache["best_params"][i].data
+        # reset model parameters to best epoch
+        if self.use_best_params:
+            msg += f" Resetting parameters best epoch {self.best_epoch}."
+            self._restore_best_params()
+
+        print(msg)
+        trainer_cache["abort"] = True
+
+    def _save_best_params(self) -> None:
+        params = list(self.model.get_parameters())
+        device = self.model.device
+
+        # snapshots are kept in host memory that is allocated once, for GPU parameters
+        # it is page-locked, so copies can run asynchronously
+        if self.best_params is None:
+            alloc = numpy.empty if device == cpu else pinned_empty
+            self.best_params = [alloc(p.shape, p.dtype.t) for p in params]
 
-            print(msg)
-            trainer_cache["abort"] = True
+        if device == cpu:
+            for p, best_p in zip(params, self.best_params):
+                best_p[...] = p.data
+            return
+
+        cupy = device.module
+        with device:
+            if self._stream is None:
+                self._stream = cupy.cuda.Stream(non_blocking=True)
+            compute_stream = cupy.cuda.get_current_stream()
+            self._stream.wait_event(compute_stream.record())
+            for p, best_p in zip(params, self.best_params):
+                p.data.get(stream=self._stream, out=best_p, blocking=False)
+
+            # later parameter updates must not overtake the copies
+            compute_stream.wait_event(self._stream.record())
+
+    def _restore_best_params(self) -> None:
+        if self._stream is not None:
+            self._stream.synchronize()
+        if self.best_params is None:
+            return
+        for p, best_p in zip(self.model.get_parameters(), self.best_params):
+            if p.device == cpu:
+                p.data[...] = best_p
+            else:
+                p.data.set(best_p)
@@ -1,14 +1,17 @@
 """Dataloaders."""
 
+from __future__ import annotations
+
 import math
 from collections.abc import Callable, Iterator
-from functools import wraps
+from functools import partial, wraps
+from queue import Queue
+from threading import Event, Thread
 from typing import Any
 
-from ...backend import Device, cpu
+from ...backend import CUDA, ArrayLike, Device, cpu, data_to_device, pinned_empty
 from ...random.random import permutation
-from ...tensor_ops.creation_ops import arange
-from ...tensor_ops.shape_ops import concat
+from ...tensor_ops.creation_ops import arange, empty
 from ...tensors import Tensor
 from ...typing import int64
 
@@ -31,6 +34,22 @@ class Dataloader:
     drop_remaining : bool, optional
         Whether to drop data, that remains when the number of samples is not divisible by
         ``batch_size``. Defaults to ``False``.
+    shuffle_granularity : int, optional
+        Number of consecutive samples that are kept together as a shard when shuffling.
+        Defaults to ``1``. Shuffling shards instead of single samples keeps reads contiguous.
+    num_workers : int, optional
+        Number of background threads used to load batches. Defaults to ``0``.
+        If ``0``, batches are loaded in the main thread when they are requested.
+        Workers are not used if the data is neither shuffled nor moved to another
+        device, since batches are then sliced from the data.
+    prefetch_factor : int, optional
+        Number of batches each worker loads in advance. Defaults to ``2``.
+
+    Raises
+    ------
+    ValueError
+        If ``shuffle_granularity`` or ``prefetch_factor`` is smaller than ``1`` or
+        ``num_workers`` is negative.
     """
 
     def __init__(
@@ -40,33 +59,268 @@ class Dataloader:
         device: Device = cpu,
         shuffle_data: bool = True,
         drop_remaining: bool = False,
+        shuffle_granularity: int = 1,
+        num_workers: int = 0,
+        prefetch_factor: int = 2,
     ) -> None:
+        if shuffle_granularity < 1:
+            raise ValueError(
+                f"Shuffle granularity must be at least 1, got {shuffle_granularity}."
+            )
+        if num_workers < 0:
+            raise ValueError(
+                f"Number of workers must not be negative, got {num_workers}."
+            )
+        if prefetch_factor < 1:
+            raise ValueError(
+                f"Prefetch factor must be at least 1, got {prefetch_factor}."
+            )
+
         self.data = data
         self._n = len(self.data[0])
         self.batch_size = min(batch_size, self._n)
         self.device = device
         self.shuffle = shuffle_data
         self._additional_batch = not drop_remaining and self._n % self.batch_size > 0
+        self._n_full = self._n // self.batch_size
+        self._n_trunc = self._n_full * self.batch_size
+        self._n_steps = max(1, self._n_full + self._additional_batch)
+        self.shuffle_granularity = shuffle_granularity
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self._needs_transfer = self.data[0].device != device
+
+        # moving a dataset that fits on the GPU once replaces a copy per batch
+        if self._needs_transfer and isinstance(device, CUDA):
+            nbytes = sum(t.nbytes for t in self.data)
+            if nbytes < 0.5 * device.memory_info["free"]:
+                self.data = tuple(t.to_device(device) for t in self.data)
+                self._needs_transfer = False
 
     def __call__(self) -> Iterator[tuple[Tensor, ...]]:
-        """Yields batched data.
+        """Returns an iterator over batched data.
 
-        Yields
+        Returns
         -------
-        Tensor
-            Batched features.
-        Tensor
-            Batched labels.
+        Iterator[tuple[Tensor, ...]]
+            Iterator yielding tuples of batched tensors.
 
         """
-        idx = permutation(self._n) if self.shuffle else arange(self._n, dtype=int64)
+        return _DataloaderIterator(self._get_batch_loader(), self._n_steps)
+
+    def __iter__(self) -> Iterator[tuple[Tensor, ...]]:
+        return self()
+
+    def _get_batch_loader(self) -> Callable[[int], tuple[Tensor, ...]]:
+        if not self.shuffle and not self._needs_transfer:
+            return self._slice_batch
+
+        batch_indices = self._get_batch_indices()
+
+        if self.num_workers == 0 and not self._needs_transfer:
+            return partial(self._take_batch, batch_indices)
+
+        # workers and device transfers keep state across batches in a generator
+        if self.num_workers == 0:
+            batches = self._load_batches(batch_indices)
+        else:
+            batches = self._collect_batches(batch_indices)
+        return partial(self._next_loaded_batch, batches)
+
+    @staticmethod
+    def _next_loaded_batch(
+        batches: Iterator[tuple[Tensor, ...]], _: int
+    ) -> tuple[Tensor, ...]:
+        return next(batches)
+
+    def _slice_batch(self, i: int) -> tuple[Tensor, ...]:
+        # unshuffled batches are contiguous, so they are copied instead of gathered,
+        # batches must not alias the data, which could be modified in place
+        b = self.batch_size
+        return tuple(Tensor(t.data[i * b : (i + 1) * b].copy()) for t in self.data)
+
+    def _take_batch(self, batch_indices: list[ArrayLike], i: int) -> tuple[Tensor, ...]:
+        batch_idx = batch_indices[i]
+        return tuple(Tensor(t.data.take(batch_idx, axis=0)) for t in self.data)
+
+    def _get_batch_indices(self) -> list[ArrayLike]:
+        idx = self._get_indices()
+
+        # resolve all batch indices at once instead of slicing per step
+        batch_indices = list(
+            idx[: self._n_trunc].view((self._n_full, self.batch_size)).data
+        )
+        if self._additional_batch:
+            batch_indices.append(idx.data[self._n_trunc :])
+        return batch_indices
+
+    def _collect_batches(
+        self, batch_indices: list[ArrayLike]
+    ) -> Iterator[tuple[Tensor, ...]]:
+        # worker w loads every num_workers-th batch, so batches are collected
+        # from the workers' queues in turns to preserve the order
+        queues: list[Queue] = [
+            Queue(self.prefetch_factor) for _ in range(self.num_workers)
+        ]
+        stop = Event()
+        for w, queue in enumerate(queues):
+            worker_indices = batch_indices[w :: self.num_workers]
+            Thread(
+                target=self._worker, args=(worker_indices, queue, stop), daemon=True
+            ).start()
+
+        try:
+            for i in range(len(batch_indices)):
+                batch = queues[i % self.num_workers].get()
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            # unblock workers waiting for space in a queue, if the pass is abandoned
+            stop.set()
+            for queue in queues:
+                while not queue.empty():
+                    queue.get_nowait()
+
+    def _get_indices(self) -> Tensor:
+        device = self.data[0].device
+        if not self.shuffle:
+            return arange(self._n, device=device, dtype=int64)
+        if self.shuffle_granularity == 1:
+            return permutation(self._n, device=device)
+
+        # permute shards of consecutive samples instead of single samples
+        g = self.shuffle_granularity
+        shards = permutation(math.ceil(self._n / g), device=device)
+        offsets = arange(g, device=device, dtype=int64)
+        idx = (shards.view((-1, 1)) * g + offsets).view((-1,))
+        return idx[idx < self._n]  # last shard may be incomplete
+
+    def _worker(
+        self, batch_indices: list[ArrayLike], queue: Queue, stop: Event
+    ) -> None:
+        try:
+            for batch in self._load_batches(batch_indices):
+                if stop.is_set():
+                    return
+                queue.put(batch)
+        except Exception as e:
+            if not stop.is_set():
+                queue.put(e)
+
+    def _load_batches(
+        self, batch_indices: list[ArrayLike]
+    ) -> Iterator[tuple[Tensor, ...]]:
+        if not self._needs_transfer:
+            for batch_idx in batch_indices:
+                yield tuple(Tensor(t.data.take(batch_idx, axis=0)) for t in self.data)
+        elif self.data[0].device == cpu:
+            yield from self._prefetch_to_gpu(batch_indices)
+        else:
+            yield from self._copy_to_device(batch_indices)
 
-        for i in range(len(self)):
-            batch_idx = idx[i * self.batch_size : (i + 1) * self.batch_size]
-            yield tuple(t[batch_idx].to_device(self.device) for t in self.data)
+    def _copy_to_device(
+        self, batch_indices: list[ArrayLike]
+    ) -> Iterator[tuple[Tensor, ...]]:
+        # batches are copied to the target device anyway, so a single staging
+        # buffer per tensor can be reused for gathering
+        buffers = [
+            empty((self.batch_size, *t.shape[1:]), device=t.device, dtype=t.dtype)
+            for t in self.data
+        ]
+        for batch_idx in batch_indices:
+            b = len(batch_idx)
+            yield tuple(
+                Tensor(
+                    data_to_device(
+                        t.data.take(batch_idx, axis=0, out=buf.data[:b]), self.device
+                    )
+                )
+                for t, buf in zip(self.data, buffers)
+            )
+
+    def _prefetch_to_gpu(
+        self, batch_indices: list[ArrayLike]
+    ) -> Iterator[tuple[Tensor, ...]]:
+        # Batches are gathered into two alternating page-locked staging buffers and
+        # copied on a separate stream, so the copy of the next batch overlaps with
+        # the computations on the current one.
+        cupy = self.device.module
+        copy_stream = cupy.cuda.Stream(non_blocking=True)
+        buffers = [
+            [
+                pinned_empty((self.batch_size, *t.shape[1:]), t.dtype.t)
+                for t in self.data
+            ]
+            for _ in range(2)
+        ]
+        events: list[Any] = [None, None]
+
+        def load_batch(i: int) -> list[ArrayLike]:
+            slot = i % 2
+            if events[slot] is not None:
+                events[slot].synchronize()  # staging buffer is still being copied
+            batch_idx = batch_indices[i]
+            b = len(batch_idx)
+
+            with self.device:
+                # memory may be reused from batches still in use by the compute stream
+                copy_stream.wait_event(cupy.cuda.get_current_stream().record())
+                arrays = []
+                for t, buf in zip(self.data, buffers[slot]):
+                    host_array = t.data.take(batch_idx, axis=0, out=buf[:b])
+                    array = cupy.empty(host_array.shape, host_array.dtype)
+                    array.set(host_array, stream=copy_stream)
+                    arrays.append(array)
+                events[slot] = copy_stream.record()
+            return arrays
+
+        n_steps = len(batch_indices)
+        next_arrays = load_batch(0)
+        for i in range(n_steps):
+            arrays, event = next_arrays, events[i % 2]
+            if i + 1 < n_steps:
+                next_arrays = load_batch(i + 1)
+            with self.device:
+                cupy.cuda.get_current_stream().wait_event(event)
+            yield tuple(Tensor(a) for a in arrays)
 
     def __len__(self) -> int:
-        return max(1, self._n // self.batch_size + self._additional_batch)
+        return self._n_steps
+
+
+class _DataloaderIterator:
+    """Iterator over one pass of a dataloader.
+
+    Parameters
+    ----------
+    load_batch : Callable[[int], tuple[Tensor, ...]]
+        Function returning the batch of a given step.
+    n_steps : int
+        Number of batches in the pass.
+    """
+
+    __slots__ = ("_load_batch", "_n_steps", "_step")
+
+    def __init__(
+        self, load_batch: Callable[[int], tuple[Tensor, ...]], n_steps: int
+    ) -> None:
+        self._load_batch = load_batch
+        self._n_steps = n_steps
+        self._step = 0
+
+    def __iter__(self) -> _DataloaderIterator:
+        return self
+
+    def __next__(self) -> tuple[Tensor, ...]:
+        if self._step == self._n_steps:
+            raise StopIteration
+        batch = self._load_batch(self._step)
+        self._step += 1
+        return batch
+
+    def __len__(self) -> int:
+        return self._n_steps
 
 
 def batched(
@@ -94,7 +348,22 @@ def batched(
     @wraps(func)
     def wrapper(x: Tensor, *args: Any, **kwargs: Any) -> Tensor:
         dataloader = Dataloader((x,), batch_size, device, shuffle_data, drop_remaining)
-        ys = [func(*x_batch, *args, **kwargs) for x_batch in dataloader()]
-        return concat(ys, dim=0)
+        batches = dataloader()
+
+        # the output is allocated once the shape of the first batch result is known
+        y = func(*next(batches), *args, **kwargs)
+        n = len(y)
+        n_total = len(x)
+        if drop_remaining:
+            n_total -= n_total % dataloader.batch_size
+        out = empty((n_total, *y.shape[1:]), device=y.device, dtype=y.dtype)
+        out.data[:n] = y.data
+
+        for x_batch in batches:
+            y = func(*x_batch, *args, **kwargs)
+            out.data[n : n + len(y)] = y.data
+            n += len(y)
+
+        return out
 
     return wrapper
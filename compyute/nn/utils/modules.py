@@ -1,13 +1,26 @@
 """Module utilities."""
 
+import json
+import pickle
+from itertools import pairwise
 from typing import Any
 
-from ...tensor_ops.creation_ops import ones
+import numpy
+
+from ...backend import Device, cpu, data_to_device
+from ...tensor_ops.creation_ops import ones, zeros_like
+from ...tensor_ops.unary_ops import sqrt
 from ...tensors import ShapeLike
 from ...typing import DType, float32
-from ..modules.module import Module
+from ..modules.containers import Sequential
+from ..modules.convolutions import Conv1D, Conv2D
+from ..modules.module import Identity, Module
+from ..modules.normalizations import BatchNorm1D, BatchNorm2D
+from ..parameter import Parameter
+
+__all__ = ["get_module_summary", "save_module", "load_module", "fuse_batchnorm"]
 
-__all__ = ["get_module_summary"]
+_ALIGNMENT = 64
 
 
 def get_module_summary(
@@ -107,3 +120,158 @@ def get_module_summary(
     summary.append(f"Trainable parameters: {n_train_params}")
 
     return "\n".join(summary)
+
+
+def save_module(module: Module, filepath: str) -> None:
+    """Saves a module to a binary file.
+
+    Parameters and buffers are written as raw bytes following a small header,
+    so they can be memory-mapped by :func:`load_module` instead of being unpickled.
+
+    Parameters
+    ----------
+    module : Module
+        Module to save.
+    filepath : str
+        Where to save the file to.
+    """
+    tensors: dict[int, tuple[str, Any]] = {}
+    for name, t in module._get_pointer_state_dict().items():
+        if id(t) not in tensors:  # shared tensors are only stored once
+            tensors[id(t)] = (name, t)
+
+    # pickle the module without tensor data
+    cache = [(t, t.data, t.grad) for _, t in tensors.values()]
+    try:
+        for t, _, _ in cache:
+            t.data = t.grad = None
+        module_bytes = pickle.dumps(module)
+    finally:
+        for t, data, grad in cache:
+            t.data, t.grad = data, grad
+
+    specs: list[dict[str, Any]] = []
+    arrays: list[numpy.ndarray] = []
+    offset = 0
+    for name, t in tensors.values():
+        array = numpy.ascontiguousarray(t.to_cpu().data)
+        dtype, shape, nbytes = array.dtype.str, array.shape, array.nbytes
+        specs.append(
+            {
+                "name": name,
+                "dtype": dtype,
+                "shape": shape,
+                "offset": offset,
+                "nbytes": nbytes,
+            }
+        )
+        arrays.append(array)
+        offset = _align(offset + nbytes)
+
+    header = json.dumps({"module_nbytes": len(module_bytes), "tensors": specs}).encode()
+
+    with open(filepath, "wb") as file:
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        file.write(module_bytes)
+        payload_start = _align(file.tell())
+        for spec, array in zip(specs, arrays):
+            file.seek(payload_start + spec["offset"])
+            array.tofile(file)
+
+
+def load_module(filepath: str, device: Device = cpu) -> Module:
+    """Loads a module from a binary file created by :func:`save_module`.
+
+    Parameters and buffers loaded to the CPU are memory-mapped copy-on-write views of
+    the file, so they are only read from disk when accessed and the file is never modified.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the binary file to load.
+    device : Device, optional
+        Device to load the parameters and buffers to. Defaults to :class:`compyute.cpu`.
+
+    Returns
+    -------
+    Module
+        Loaded module.
+    """
+    with open(filepath, "rb") as file:
+        header_nbytes = int.from_bytes(file.read(8), "little")
+        header = json.loads(file.read(header_nbytes))
+        module = pickle.loads(file.read(header["module_nbytes"]))
+        payload_start = _align(file.tell())
+
+    # an empty payload can not be memory-mapped
+    if any(spec["nbytes"] for spec in header["tensors"]):
+        payload = numpy.memmap(filepath, numpy.uint8, mode="c", offset=payload_start)
+    state_dict = module._get_pointer_state_dict()
+
+    for spec in header["tensors"]:
+        if spec["nbytes"] == 0:
+            array = numpy.empty(spec["shape"], spec["dtype"])
+        else:
+            start = spec["offset"]
+            stop = start + spec["nbytes"]
+            array = payload[start:stop].view(spec["dtype"]).reshape(spec["shape"])
+        state_dict[spec["name"]].data = (
+            array if device == cpu else data_to_device(array, device)
+        )
+
+    return module
+
+
+def _align(nbytes: int) -> int:
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def fuse_batchnorm(module: Module) -> None:
+    """Folds batch normalization modules into preceding convolution modules
+    for inference.
+
+    Within :class:`compyute.nn.Sequential` containers, every
+    :class:`compyute.nn.BatchNorm1D` or :class:`compyute.nn.BatchNorm2D` directly
+    following a :class:`compyute.nn.Conv1D` or :class:`compyute.nn.Conv2D` has its
+    running statistics and affine parameters folded into the weights and biases of
+    the convolution and is replaced by :class:`compyute.nn.Identity`.
+    The fused module can not be trained anymore.
+
+    Parameters
+    ----------
+    module : Module
+        Module to fuse batch normalization modules in.
+
+    Raises
+    ------
+    AttributeError
+        If the module is in training mode.
+    """
+    if module.is_training:
+        raise AttributeError(f"{module.label} is not in inference mode.")
+
+    fusable = ((Conv1D, BatchNorm1D), (Conv2D, BatchNorm2D))
+    containers = (
+        m for m in (module, *module.get_modules()) if isinstance(m, Sequential)
+    )
+
+    for container in list(containers):
+        for i, (conv, bn) in enumerate(pairwise(container.layers)):
+            if not any(isinstance(conv, c) and isinstance(bn, b) for c, b in fusable):
+                continue
+
+            # y = scale * (conv(x) + b - rmean) + bn.b
+            scale = bn.w / sqrt(bn.rvar + bn.eps)
+            conv.w.data *= scale.view((-1,) + (1,) * (conv.w.ndim - 1)).data
+            if conv.b is None:
+                conv.b = Parameter(zeros_like(bn.b))
+                conv.bias = True
+            conv.b.data = ((conv.b - bn.rmean) * scale + bn.b).data
+
+            identity = Identity()
+            identity.inference()
+            container.layers[i + 1] = identity
+            for name, child in container._modules.items():
+                if child is bn:
+                    container._modules[name] = identity
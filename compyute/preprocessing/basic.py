@@ -3,7 +3,7 @@
 from typing import Optional
 
 from ..random.random import shuffle
-from ..tensor_ops.creation_ops import identity
+from ..tensor_ops.creation_ops import arange, zeros
 from ..tensors import DimLike, Tensor
 from ..typing import DType, int64, is_integer
 
@@ -122,4 +122,8 @@ def one_hot_encode(
     if not is_integer(x.dtype):
         raise ValueError(f"Input must be an integer, got '{x.dtype}'.")
 
-    return identity(num_classes, device=x.device, dtype=dtype)[x]
+    # set the target entries directly instead of indexing an identity matrix
+    y = zeros((*x.shape, num_classes), device=x.device, dtype=dtype)
+    rows = arange(x.size, device=x.device, dtype=int64)
+    y.view((x.size, num_classes))[rows, x.view((x.size,))] = 1
+    return y
@@ -19,6 +19,7 @@ __all__ = [
     "log",
     "log2",
     "log10",
+    "log1p",
     "real",
     "round",
     "sech",
@@ -321,6 +322,23 @@ def log10(x: Tensor) -> Tensor:
     return Tensor(x.device.module.log10(x.data))
 
 
+def log1p(x: Tensor) -> Tensor:
+    """Computes the element-wise natural log of one plus a tensor.
+    More accurate than ``log(1 + x)`` for small values of ``x``.
+
+    Parameters
+    ----------
+    x : Tensor
+        Input tensor.
+
+    Returns
+    -------
+    Tensor
+        Tensor containing the element-wise natural log of one plus the input.
+    """
+    return Tensor(x.device.module.log1p(x.data))
+
+
 def real(x: Tensor) -> Tensor:
     """Returns the real part of a complex tensor.
 
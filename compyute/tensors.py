@@ -174,13 +174,10 @@ class Tensor:
         )
 
     def __getitem__(self, key: Any) -> Tensor:
-        if isinstance(key, tuple):
-            return Tensor(self.data[key])
-        key = to_arraylike(key)
-        return Tensor(self.data[key])
+        return Tensor(self.data[to_key(key)])
 
     def __setitem__(self, key: Any, value: Tensor | ScalarLike) -> None:
-        self.data[to_arraylike(key)] = to_arraylike(value)
+        self.data[to_key(key)] = to_arraylike(value)
 
     def __iter__(self) -> Tensor:
         self._iterator = 0
@@ -684,3 +681,10 @@ def to_arraylike(value: Any) -> ArrayLike | ScalarLike:
     if isinstance(value, Tensor):
         return value.data
     return value
+
+
+def to_key(key: Any) -> Any:
+    """Converts an index key to a key that can be used to index array likes."""
+    if isinstance(key, tuple):
+        return tuple(to_arraylike(k) for k in key)
+    return to_arraylike(key)
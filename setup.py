@@ -31,7 +31,6 @@ setup(
     ],
     python_requires=">=3.12",
     install_requires=[
-        "cupy_cuda12x>=13.0.0",
         "ipywidgets>=8.1.2",
         "numpy>=1.26.4",
         "regex>=2023.12.25",
@@ -39,6 +38,7 @@ setup(
         "tensorboardX>=2.6.2.2",
     ],
     extras_require={
+        "cuda12": ["cupy_cuda12x>=13.0.0"],
         "dev": [
             "mypy>=1.11.2",
             "pytest>=8.2.0",
@@ -48,7 +48,7 @@ setup(
             "wheel>=0.43.0",
             "Sphinx>=7.4.7",
             "pydata_sphinx_theme>=0.15.4",
-        ]
+        ],
     },
     packages=find_packages(exclude=["tests", ".github", ".venv", "docs"]),
     include_package_data=True,
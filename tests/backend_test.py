@@ -0,0 +1,46 @@
+"""Backend tests"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# cupy imports are blocked, so the CPU-only install is tested regardless of whether
+# CuPy is available
+cpu_only_script = """
+import sys
+
+sys.modules["cupy"] = None
+
+import pytest
+
+import compyute as cp
+from compyute.backend import CUDARuntimeError, gpu_available, pinned_empty
+from compyute.nn import Linear
+from compyute.nn.utils import Dataloader
+
+assert not gpu_available()
+assert pinned_empty((2, 3), float).shape == (2, 3)
+assert cp.zeros((2,)).to_device(cp.cpu).device == cp.cpu
+
+x = cp.zeros((4, 2))
+for fn in (
+    lambda: cp.zeros((2,), device=cp.cuda),
+    lambda: x.to_device(cp.cuda),
+    lambda: Linear(2, 2).to_device(cp.cuda),
+    lambda: cp.cuda.memory_info,
+    lambda: Dataloader((x,), device=cp.cuda),
+):
+    with pytest.raises(CUDARuntimeError, match="CuPy is not installed"):
+        fn()
+"""
+
+
+def test_cpu_only() -> None:
+    """Test for using the CPU and GPU devices without CuPy installed."""
+    result = subprocess.run(
+        [sys.executable, "-c", cpu_only_script],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parents[1],
+    )
+    assert result.returncode == 0, result.stderr
@@ -4,6 +4,7 @@ import pytest
 import torch
 
 from compyute.nn import BatchNorm1D, BatchNorm2D, LayerNorm, RMSNorm
+from compyute.typing import float16
 from tests.utils import get_random_floats, is_close
 
 bn1d_testdata = [(8, 16), (8, 16, 32)]
@@ -86,9 +87,15 @@ def test_layernorm(shape, normalized_shape, eps) -> None:
     """Test for the layernorm layer."""
     # init compyute module
     compyute_module = LayerNorm(normalized_shape, eps)
+    compyute_w, torch_w = get_random_floats(normalized_shape, low=0.5, high=1.5)
+    compyute_b, torch_b = get_random_floats(normalized_shape)
+    compyute_module.w.data = compyute_w.data
+    compyute_module.b.data = compyute_b.data
 
     # init torch module
     torch_module = torch.nn.LayerNorm(normalized_shape, eps)
+    torch_module.weight = torch.nn.Parameter(torch_w)
+    torch_module.bias = torch.nn.Parameter(torch_b)
 
     # forward
     compyute_x, torch_x = get_random_floats(shape)
@@ -105,6 +112,101 @@ def test_layernorm(shape, normalized_shape, eps) -> None:
     assert is_close(compyute_module.b.grad, torch_module.bias.grad)
 
 
+@pytest.mark.parametrize("shape,normalized_shape", ln_testdata)
+def test_layernorm_quantized(shape, normalized_shape) -> None:
+    """Test for the layernorm layer using int8 quantized parameters."""
+    # init compyute module
+    compyute_module = LayerNorm(normalized_shape)
+    compyute_w, torch_w = get_random_floats(normalized_shape)
+    compyute_b, torch_b = get_random_floats(normalized_shape, low=-0.2)
+    compyute_module.w.data = compyute_w.data
+    compyute_module.b.data = compyute_b.data
+    compyute_module.inference()
+    compyute_module.quantize()
+
+    # init torch module
+    torch_module = torch.nn.LayerNorm(normalized_shape)
+    torch_module.weight = torch.nn.Parameter(torch_w)
+    torch_module.bias = torch.nn.Parameter(torch_b)
+
+    # forward
+    compyute_x, torch_x = get_random_floats(shape)
+    compyute_y = compyute_module(compyute_x)
+    torch_y = torch_module(torch_x)
+    assert is_close(compyute_y, torch_y, tol=1e-2)
+
+
+@pytest.mark.parametrize("shape", bn1d_testdata)
+def test_batchnorm1d_quantized(shape) -> None:
+    """Test for the batchnorm 1d layer using int8 quantized parameters."""
+    compyute_module = BatchNorm1D(shape[1])
+    torch_module = torch.nn.BatchNorm1d(shape[1])
+    compyute_x, torch_x = _init_quantized_batchnorm(
+        compyute_module, torch_module, shape
+    )
+
+    # forward
+    compyute_y = compyute_module(compyute_x)
+    torch_y = torch_module(torch_x)
+    assert is_close(compyute_y, torch_y, tol=1e-2)
+
+
+@pytest.mark.parametrize("shape", bn2d_testdata)
+def test_batchnorm2d_quantized(shape) -> None:
+    """Test for the batchnorm 2d layer using int8 quantized parameters."""
+    compyute_module = BatchNorm2D(shape[1])
+    torch_module = torch.nn.BatchNorm2d(shape[1])
+    compyute_x, torch_x = _init_quantized_batchnorm(
+        compyute_module, torch_module, shape
+    )
+
+    # forward
+    compyute_y = compyute_module(compyute_x)
+    torch_y = torch_module(torch_x)
+    assert is_close(compyute_y, torch_y, tol=1e-2)
+
+
+@pytest.mark.parametrize("shape", bn2d_testdata)
+def test_batchnorm2d_quantized_to_type(shape) -> None:
+    """Test for casting a batchnorm 2d layer after quantizing its parameters."""
+    compyute_module = BatchNorm2D(shape[1])
+    torch_module = torch.nn.BatchNorm2d(shape[1])
+    compyute_x, torch_x = _init_quantized_batchnorm(
+        compyute_module, torch_module, shape
+    )
+    compyute_module.to_type(float16)
+
+    # forward
+    compyute_y = compyute_module(compyute_x.to_type(float16))
+    torch_y = torch_module(torch_x)
+    assert compyute_y.dtype == float16
+    assert is_close(compyute_y, torch_y, tol=1e-2)
+    assert all(b.dtype == float16 for b in compyute_module.get_buffers())
+    assert len(compyute_module.get_state_dict()) == 4
+
+
+def _init_quantized_batchnorm(compyute_module, torch_module, shape):
+    """Sets equal random parameters and running statistics and quantizes the
+    compyute module."""
+    n = shape[1]
+    compyute_w, torch_w = get_random_floats((n,), low=0.5, high=1.5)
+    compyute_b, torch_b = get_random_floats((n,), low=-0.2)
+    compyute_module.w.data[:] = compyute_w.data
+    compyute_module.b.data[:] = compyute_b.data
+    torch_module.weight = torch.nn.Parameter(torch_w)
+    torch_module.bias = torch.nn.Parameter(torch_b)
+
+    # update running statistics once
+    compyute_x, torch_x = get_random_floats(shape, low=-1.0, high=1.0)
+    compyute_module(compyute_x)
+    torch_module(torch_x)
+
+    compyute_module.inference()
+    compyute_module.quantize()
+    torch_module.eval()
+    return compyute_x, torch_x
+
+
 @pytest.mark.parametrize("shape,normalized_shape", rms_testdata)
 @pytest.mark.parametrize("eps", eps_testdata)
 def test_rmsnorm(shape, normalized_shape, eps) -> None:
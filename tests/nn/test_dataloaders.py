@@ -0,0 +1,115 @@
+"""Dataloader tests"""
+
+import threading
+import time
+
+import numpy
+import pytest
+
+import compyute as cp
+from compyute.nn.utils import Dataloader
+
+n_samples = 23
+batch_size = 5
+workers_testdata = [0, 1, 3]
+
+
+def _get_data() -> tuple[cp.Tensor, cp.Tensor]:
+    x = cp.tensor(numpy.arange(n_samples * 3, dtype=numpy.float32).reshape(-1, 3))
+    y = cp.tensor(numpy.arange(n_samples))
+    return x, y
+
+
+def _wait_for_threads(n_threads: int, timeout: float = 2.0) -> int:
+    deadline = time.perf_counter() + timeout
+    while threading.active_count() > n_threads and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return threading.active_count()
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("drop_remaining", [False, True])
+@pytest.mark.parametrize("num_workers", workers_testdata)
+def test_dataloader(shuffle, drop_remaining, num_workers) -> None:
+    """Test for the batch sizes, order and coverage of the dataloader."""
+    x, y = _get_data()
+    dataloader = Dataloader(
+        (x, y), batch_size, cp.cpu, shuffle, drop_remaining, num_workers=num_workers
+    )
+    batches = list(dataloader())
+    assert len(batches) == len(dataloader)
+
+    # samples are kept together and returned at most once
+    xs = numpy.concatenate([b[0].data for b in batches])
+    ys = numpy.concatenate([b[1].data for b in batches])
+    assert numpy.array_equal(xs[:, 0] // 3, ys)
+    assert len(set(ys.tolist())) == len(ys)
+    assert len(ys) == (20 if drop_remaining else n_samples)
+    if not shuffle:
+        assert numpy.array_equal(ys, numpy.arange(len(ys)))
+
+
+@pytest.mark.parametrize("num_workers", workers_testdata)
+def test_dataloader_concurrent_passes(num_workers) -> None:
+    """Test for concurrent passes over the same dataloader being independent."""
+    x, y = _get_data()
+    dataloader = Dataloader((x, y), batch_size, num_workers=num_workers)
+
+    iterator1 = dataloader()
+    batch1 = next(iterator1)[1].data
+    iterator2 = dataloader()
+    next(iterator2)
+    batch2 = next(iterator1)[1].data
+    assert not set(batch1.tolist()) & set(batch2.tolist())
+
+    # a new pass is started after an interrupted one
+    for _ in dataloader:
+        break
+    assert len(list(dataloader)) == len(dataloader)
+
+
+def test_dataloader_no_aliasing() -> None:
+    """Test for unshuffled batches not sharing memory with the data."""
+    x, y = _get_data()
+    for x_batch, _ in Dataloader((x, y), batch_size, shuffle_data=False)():
+        x_batch += 100.0
+    assert numpy.array_equal(x.data, _get_data()[0].data)
+
+
+def test_dataloader_abandoned_pass() -> None:
+    """Test for workers stopping when a pass is abandoned."""
+    x, y = _get_data()
+    n_threads = threading.active_count()
+    dataloader = Dataloader((x, y), 1, num_workers=2, prefetch_factor=1)
+
+    for _ in range(3):
+        for _ in dataloader():
+            break
+    with pytest.raises(KeyboardInterrupt):
+        for _ in dataloader():
+            raise KeyboardInterrupt
+    assert _wait_for_threads(n_threads) == n_threads
+
+
+def test_dataloader_worker_exception() -> None:
+    """Test for exceptions of workers being raised in the consuming thread."""
+    x, y = _get_data()
+    dataloader = Dataloader((x, y), batch_size, num_workers=2)
+
+    def load_batches(batch_indices):
+        raise RuntimeError("worker failed")
+        yield
+
+    dataloader._load_batches = load_batches
+    with pytest.raises(RuntimeError, match="worker failed"):
+        list(dataloader())
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"shuffle_granularity": 0}, {"num_workers": -1}, {"prefetch_factor": 0}],
+)
+def test_dataloader_invalid_arguments(kwargs) -> None:
+    """Test for invalid dataloader arguments."""
+    with pytest.raises(ValueError):
+        Dataloader(_get_data(), batch_size, **kwargs)
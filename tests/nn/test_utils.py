@@ -0,0 +1,109 @@
+"""Neural network utility tests"""
+
+import os
+
+import numpy
+import pytest
+
+from compyute.nn import (
+    BatchNorm1D,
+    BatchNorm2D,
+    Conv1D,
+    Conv2D,
+    Identity,
+    LayerNorm,
+    Linear,
+    ReLU,
+    Sequential,
+)
+from compyute.nn.utils import fuse_batchnorm, load_module, save_module
+from tests.utils import get_random_floats
+
+fuse_testdata = [
+    (Conv1D, BatchNorm1D, (8, 4, 32)),
+    (Conv2D, BatchNorm2D, (8, 4, 16, 16)),
+]
+
+
+def test_save_load_module(tmp_path) -> None:
+    """Test for saving and loading a module."""
+    filepath = str(tmp_path / "module.cp")
+
+    # init module with a weight shared between two layers
+    module = Sequential(Linear(16, 16), BatchNorm1D(16), ReLU(), Linear(16, 16))
+    module.layers[3].w = module.layers[0].w
+    x, _ = get_random_floats((8, 16))
+    module(x)  # update running statistics
+    module.inference()
+    y = module(x)
+
+    save_module(module, filepath)
+    with open(filepath, "rb") as file:
+        file_bytes = file.read()
+
+    loaded_module = load_module(filepath)
+    loaded_module.inference()
+    assert numpy.array_equal(loaded_module(x).data, y.data)
+    assert loaded_module.layers[3].w is loaded_module.layers[0].w
+
+    # loaded tensors are writable, but edits are not written to the file
+    for p in loaded_module.get_parameters():
+        p.data += 1.0
+    for b in loaded_module.get_buffers():
+        b.data *= 2.0
+    with open(filepath, "rb") as file:
+        assert file.read() == file_bytes
+
+
+def test_save_load_empty_module(tmp_path) -> None:
+    """Test for saving and loading a module with zero-size tensors only."""
+    filepath = str(tmp_path / "module.cp")
+    module = BatchNorm1D(0)
+    save_module(module, filepath)
+
+    loaded_module = load_module(filepath)
+    assert all(t.shape == (0,) for t in loaded_module.get_state_dict().values())
+
+
+def test_save_load_quantized_module(tmp_path) -> None:
+    """Test for saving and loading a module with quantized parameters."""
+    filepath = str(tmp_path / "module.cp")
+    quantized_filepath = str(tmp_path / "quantized_module.cp")
+
+    module = LayerNorm((1024,))
+    w, _ = get_random_floats((1024,), low=0.5, high=1.5)
+    module.w.data = w.data
+    module.inference()
+    save_module(module, filepath)
+
+    module.quantize()
+    x, _ = get_random_floats((8, 1024))
+    y = module(x)
+    save_module(module, quantized_filepath)
+
+    # quantized values are not saved, but computed again after loading
+    assert os.path.getsize(quantized_filepath) == os.path.getsize(filepath)
+    loaded_module = load_module(quantized_filepath)
+    assert numpy.array_equal(loaded_module(x).data, y.data)
+
+
+@pytest.mark.parametrize("conv,bn,shape", fuse_testdata)
+@pytest.mark.parametrize("bias", [True, False])
+def test_fuse_batchnorm(conv, bn, shape, bias) -> None:
+    """Test for fusing batchnorm modules into convolution modules."""
+    module = Sequential(conv(4, 8, 3, bias=bias), bn(8), ReLU())
+
+    # update running statistics and set non-trivial affine parameters
+    x, _ = get_random_floats(shape)
+    module(x)
+    w, _ = get_random_floats((8,), low=0.5, high=1.5)
+    b, _ = get_random_floats((8,))
+    module.layers[1].w.data[:] = w.data
+    module.layers[1].b.data[:] = b.data
+    module.inference()
+    y = module(x)
+
+    fuse_batchnorm(module)
+    assert isinstance(module.layers[1], Identity)
+    assert module.layers[1].label == "Identity"
+    assert numpy.allclose(module(x).data, y.data, atol=1e-5)